@@ -3,7 +3,6 @@ from google import genai
 import pandas as pd
 import random
 import io
-import re
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
@@ -20,13 +19,15 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
 from reportlab.lib import colors
 from reportlab.lib.colors import HexColor
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.enums import TA_CENTER
 
 # Google API関連
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 
+from md_renderer import REGISTERED_FONT_NAME, MarkdownFlowableRenderer, render_markdown
+
 # --- 1. 設定とデータ定義 ---
 
 # カテゴリ定義
@@ -97,7 +98,6 @@ TRAIT_CATEGORY_MAP = {
 
 # --- フォント設定 ---
 FONT_FILE = "ipaexg.ttf"
-REGISTERED_FONT_NAME = "IPAexGothic"
 
 if not os.path.exists(FONT_FILE):
     st.error(f"⚠️ エラー: フォントファイル `{FONT_FILE}` が見つかりません。")
@@ -156,7 +156,7 @@ def create_radar_chart(scores_by_category):
     buf.seek(0)
     return buf
 
-def create_pdf(name, role_name, all_ranked_data, category_scores, ai_text):
+def create_pdf(name, role_name, all_ranked_data, category_scores, ai_text, ai_flowables=None):
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
         buffer, 
@@ -172,8 +172,6 @@ def create_pdf(name, role_name, all_ranked_data, category_scores, ai_text):
     # スタイル定義
     title_style = ParagraphStyle(name='JpTitle', fontName=REGISTERED_FONT_NAME, fontSize=24, leading=30, alignment=TA_CENTER, spaceAfter=10*mm)
     h1_style = ParagraphStyle(name='JpH1', fontName=REGISTERED_FONT_NAME, fontSize=18, leading=22, spaceBefore=15*mm, spaceAfter=10*mm, textColor=colors.navy, borderPadding=5, borderWidth=0, backColor=colors.whitesmoke)
-    h2_style = ParagraphStyle(name='JpH2', fontName=REGISTERED_FONT_NAME, fontSize=14, leading=18, spaceBefore=12*mm, spaceAfter=6*mm, textColor=colors.darkblue)
-    body_style = ParagraphStyle(name='JpBody', fontName=REGISTERED_FONT_NAME, fontSize=10.5, leading=18, spaceAfter=3*mm, alignment=TA_LEFT)
     caption_style = ParagraphStyle(name='JpCaption', fontName=REGISTERED_FONT_NAME, fontSize=9, leading=12, textColor=colors.grey, alignment=TA_CENTER)
 
     # 1ページ目：サマリー
@@ -279,29 +277,10 @@ def create_pdf(name, role_name, all_ranked_data, category_scores, ai_text):
     # 3ページ目：AIレポート
     elements.append(Paragraph("■ AIによるプロファイリング分析", h1_style))
     
-    # Markdown簡易パース
-    h_pattern = re.compile(r'^(#+)\s*(.*)')
-    for line in ai_text.split('\n'):
-        line = line.strip()
-        if not line:
-            elements.append(Spacer(1, 4*mm))
-            continue
-        
-        line = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        line = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', line)
-
-        match = h_pattern.match(line)
-        if match:
-            clean_text = match.group(2)
-            elements.append(Paragraph(clean_text, h2_style))
-        elif line.startswith('- ') or line.startswith('* '):
-            clean_text = line[2:].strip()
-            list_style = ParagraphStyle(name='JpList', parent=body_style, leftIndent=5*mm, firstLineIndent=-5*mm)
-            elements.append(Paragraph(f"• {clean_text}", list_style))
-        elif line == "---":
-            elements.append(Spacer(1, 5*mm))
-        else:
-            elements.append(Paragraph(line, body_style))
+    # ストリーミング中に生成済みのFlowableがあればそれを使う
+    if ai_flowables is None:
+        ai_flowables = render_markdown(ai_text)
+    elements.extend(ai_flowables)
 
     doc.build(elements)
     buffer.seek(0)
@@ -556,7 +535,11 @@ if submitted:
 
             # AI分析
             ai_text = "（AI分析エラー）"
+            ai_flowables = None
             if client:
+                # 受信したチャンクから順にPDF用のFlowableを組み立てる
+                renderer = MarkdownFlowableRenderer()
+                text_chunks = []
                 try:
                     prompt = f"""
                     あなたはIT業界の熟練キャリアコーチです。
@@ -589,16 +572,25 @@ if submitted:
                     専門的かつ洞察に富んだ分析を行い、読者が「自分の説明書」を手に入れたと感じるような、納得感と前向きさを与える文章にしてください。
                     """
                     
-                    response = client.models.generate_content(
+                    for chunk in client.models.generate_content_stream(
                         model="gemini-3-flash-preview", 
                         contents=prompt,
-                    )
-                    ai_text = response.text
+                    ):
+                        if chunk.text:
+                            text_chunks.append(chunk.text)
+                            renderer.feed(chunk.text)
+                    ai_text = "".join(text_chunks)
+                    if text_chunks:
+                        ai_flowables = renderer.close()
                 except Exception as e:
-                    ai_text = f"AI分析中にエラーが発生しました: {e}"
+                    # 途中まで受信した内容は残し、その後ろにエラーを追記する。
+                    # レンダラ自体が失敗した可能性もあるので再利用せず、create_pdf で ai_text から描画し直す
+                    error_text = f"AI分析中にエラーが発生しました: {e}"
+                    ai_text = "\n\n".join(filter(None, ["".join(text_chunks), error_text]))
+                    ai_flowables = None
 
             # PDF生成
-            pdf_buffer = create_pdf(user_name, selected_role, sorted_scores, category_scores, ai_text)
+            pdf_buffer = create_pdf(user_name, selected_role, sorted_scores, category_scores, ai_text, ai_flowables)
             pdf_bytes = pdf_buffer.getvalue()
             save_msg = "※バックアップ機能は現在無効です"
 
@@ -0,0 +1,88 @@
+"""AIレポート描画のベンチマーク（旧来の行ごとのループとの比較）
+
+Flowable の構築だけの時間と、SimpleDocTemplate.build によるレイアウト・
+PDF出力まで含めた時間の両方を計測する。
+
+    python bench_md_renderer.py
+"""
+import io
+import os
+import re
+import statistics
+import time
+
+from reportlab.lib.units import mm
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+from md_renderer import MD_BODY_STYLE, MD_H2_STYLE, REGISTERED_FONT_NAME, render_markdown
+
+FONT_FILE = "ipaexg.ttf" if os.path.exists("ipaexg.ttf") else "Vera.ttf"
+pdfmetrics.registerFont(TTFont(REGISTERED_FONT_NAME, FONT_FILE))
+
+BLOCK = """### 2. 強みの相乗効果（Top Zone Analysis）
+**根本原因探求**と**自動化思考**が組み合わさることで、障害の再発を仕組みで防ぐ力が生まれています。
+- **可用性追求**：サービスを止めない設計を常に意識しています。
+- 手順書を整備し、チーム全体の品質を底上げします。
+* 変更管理を徹底し、**事故を未然に防ぐ**姿勢があります。
+この強み構成は、運用の安定化が求められる現場で特に評価されるでしょう。
+
+---"""
+
+
+def render_legacy(ai_text):
+    """user-026 以前の create_pdf 内のループ"""
+    elements = []
+    h_pattern = re.compile(r'^(#+)\s*(.*)')
+    for line in ai_text.split('\n'):
+        line = line.strip()
+        if not line:
+            elements.append(Spacer(1, 4*mm))
+            continue
+        line = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        line = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', line)
+        match = h_pattern.match(line)
+        if match:
+            elements.append(Paragraph(match.group(2), MD_H2_STYLE))
+        elif line.startswith('- ') or line.startswith('* '):
+            list_style = ParagraphStyle(name='JpList', parent=MD_BODY_STYLE, leftIndent=5*mm, firstLineIndent=-5*mm)
+            elements.append(Paragraph(f"• {line[2:].strip()}", list_style))
+        elif line == "---":
+            elements.append(Spacer(1, 5*mm))
+        else:
+            elements.append(Paragraph(line, MD_BODY_STYLE))
+    return elements
+
+
+def build_pdf(func, text):
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=A4, rightMargin=20*mm, leftMargin=20*mm, topMargin=25*mm, bottomMargin=25*mm)
+    doc.build(func(text))
+
+
+def bench(func, *args, repeat=7):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    text = "\n".join([BLOCK] * 1500)
+    print(f"{text.count(chr(10)) + 1} lines")
+
+    legacy = bench(render_legacy, text)
+    current = bench(render_markdown, text)
+    print("flowables only")
+    print(f"  legacy loop     : {legacy:.3f}s")
+    print(f"  render_markdown : {current:.3f}s ({legacy / current:.1f}x)")
+
+    legacy = bench(build_pdf, render_legacy, text, repeat=3)
+    current = bench(build_pdf, render_markdown, text, repeat=3)
+    print("flowables + doc.build")
+    print(f"  legacy loop     : {legacy:.3f}s")
+    print(f"  render_markdown : {current:.3f}s ({legacy / current:.2f}x)")
@@ -0,0 +1,12 @@
+import os
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from md_renderer import REGISTERED_FONT_NAME
+
+# 本番と同じフォントが無い環境では ReportLab 同梱の Vera で代用する
+FONT_FILE = "ipaexg.ttf" if os.path.exists("ipaexg.ttf") else "Vera.ttf"
+
+if REGISTERED_FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+    pdfmetrics.registerFont(TTFont(REGISTERED_FONT_NAME, FONT_FILE))
@@ -0,0 +1,214 @@
+"""AIレポート（Markdown）をReportLabのFlowableに変換するレンダラ"""
+import re
+
+from reportlab.lib.units import mm
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+# レポートで使うフォント名（app.py はこの名前でフォントを登録する）
+REGISTERED_FONT_NAME = "IPAexGothic"
+
+# 共有スタイル（PDF生成ごとに作り直さない）
+MD_H2_STYLE = ParagraphStyle(name='JpH2', fontName=REGISTERED_FONT_NAME, fontSize=14, leading=18, spaceBefore=12*mm, spaceAfter=6*mm, textColor=colors.darkblue)
+MD_H3_STYLE = ParagraphStyle(name='JpH3', parent=MD_H2_STYLE, fontSize=12, leading=16, spaceBefore=6*mm, spaceAfter=3*mm)
+MD_BODY_STYLE = ParagraphStyle(name='JpBody', fontName=REGISTERED_FONT_NAME, fontSize=10.5, leading=18, spaceAfter=3*mm, alignment=TA_LEFT)
+MD_CELL_STYLE = ParagraphStyle(name='JpCell', parent=MD_BODY_STYLE, fontSize=9, leading=13, spaceAfter=0)
+MD_HEADER_CELL_STYLE = ParagraphStyle(name='JpHeaderCell', parent=MD_CELL_STYLE, textColor=colors.white)
+
+# 箇条書き（ネストの深さごと）
+MD_LIST_MAX_DEPTH = 3
+MD_LIST_INDENT = 6*mm
+MD_LIST_STYLES = [
+    ParagraphStyle(name=f'JpList{d}', parent=MD_BODY_STYLE, leftIndent=(d+1)*MD_LIST_INDENT, bulletIndent=d*MD_LIST_INDENT, bulletFontName=REGISTERED_FONT_NAME, spaceAfter=1.5*mm)
+    for d in range(MD_LIST_MAX_DEPTH)
+]
+MD_BULLETS = ["•", "○", "・"]
+
+# 番号付きリスト（同じ深さでは最も幅の広い番号 999. に合わせて本文の開始位置を揃える）
+MD_ORDERED_WIDEST_MARKER = "999."
+_ordered_styles = {}
+
+
+def md_ordered_style(depth):
+    style = _ordered_styles.get(depth)
+    if style is None:
+        base = MD_LIST_STYLES[depth]
+        hang = max(MD_LIST_INDENT, stringWidth(MD_ORDERED_WIDEST_MARKER, base.bulletFontName, base.bulletFontSize) + 2*mm)
+        style = ParagraphStyle(name=f'JpOrdered{depth}', parent=base, leftIndent=base.bulletIndent + hang)
+        _ordered_styles[depth] = style
+    return style
+
+MD_TABLE_CMDS = [
+    ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ('LEFTPADDING', (0,0), (-1,-1), 4),
+    ('RIGHTPADDING', (0,0), (-1,-1), 4),
+    ('TOPPADDING', (0,0), (-1,-1), 4),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+]
+MD_TABLE_STYLE = TableStyle(MD_TABLE_CMDS)
+MD_TABLE_HEADER_STYLE = TableStyle(MD_TABLE_CMDS + [('BACKGROUND', (0,0), (-1,0), colors.midnightblue)])
+
+# 事前コンパイル済みのパターン
+MD_HEADING_RE = re.compile(r'^(#{1,6})\s*(.*?)(?:\s+#+)?\s*$')
+MD_HR_RE = re.compile(r'^(?:-{3,}|\*{3,}|_{3,})$')
+MD_LIST_RE = re.compile(r'^([ \t]*)([-*+]|\d{1,3}[.)])\s+(.*)$')
+MD_TABLE_SEP_RE = re.compile(r'^\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?$')
+MD_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+MD_CODE_RE = re.compile(r'`([^`]+)`')
+
+# インラインコード用の等幅フォント（日本語を含む場合は本文フォントのまま）
+MD_CODE_FONT_NAME = "Courier"
+
+# インライン要素の種別（md_frag_templates() が返すリストの添字）
+MD_PLAIN, MD_BOLD, MD_CODE = 0, 1, 2
+MD_FRAG_TEMPLATE_MARKUP = f'x<b>x</b><font name="{MD_CODE_FONT_NAME}">x</font>'
+_frag_templates = {}
+
+
+def md_inline(text):
+    """Markdownのインライン記法（太字・コード）を (種別, 文字列) のリストに分解する"""
+    # Paragraph の既定の前処理（cleanBlockQuotedText）と同じ空白の正規化
+    text = ' '.join(text.split())
+
+    # split() の奇数番目がコード部分。コード内には太字ルールを適用しない
+    parts = MD_CODE_RE.split(text) if '`' in text else [text]
+    segments = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            segments.append((MD_CODE if part.isascii() else MD_PLAIN, part))
+        elif '**' in part:
+            segments.extend((MD_BOLD if j % 2 else MD_PLAIN, p) for j, p in enumerate(MD_BOLD_RE.split(part)))
+        else:
+            segments.append((MD_PLAIN, part))
+    return [seg for seg in segments if seg[1]]
+
+
+def md_frag_templates(style):
+    """スタイルごとに一度だけマークアップを解析し、通常・太字・コードの断片を得る"""
+    templates = _frag_templates.get(style)
+    if templates is None:
+        templates = Paragraph(MD_FRAG_TEMPLATE_MARKUP, style).frags
+        _frag_templates[style] = templates
+    return templates
+
+
+def md_paragraph(text, style, bulletText=None):
+    """Markdownの1行からParagraphを作る
+
+    Paragraph のXMLパーサは行ごとに走らせると重いため、解析済みの断片を
+    複製して frags として渡す。文字列はマークアップとして解釈されないので
+    < や & のエスケープも不要になる。
+    """
+    templates = md_frag_templates(style)
+    segments = md_inline(text)
+    frags = [templates[kind].clone(text=seg) for kind, seg in segments]
+    return Paragraph("".join(seg for _, seg in segments), style, bulletText, frags=frags)
+
+
+class MarkdownFlowableRenderer:
+    """AIが返すMarkdownを逐次的にReportLabのFlowableへ変換する
+
+    feed() にストリーミングのチャンクをそのまま渡すと、改行で確定した行から
+    順に self.flowables に追加される。最後に close() で残りを確定させる。
+    対応記法：見出し、箇条書き（番号付き・ネスト）、表、区切り線、太字
+    """
+
+    def __init__(self):
+        self.flowables = []
+        self._pending = ""
+        self._table_rows = []
+        self._list_indents = []
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        self._pending += chunk
+        if '\n' not in chunk:
+            return
+        *lines, self._pending = self._pending.split('\n')
+        for line in lines:
+            self._render_line(line)
+
+    def close(self):
+        if self._pending:
+            self._render_line(self._pending)
+            self._pending = ""
+        self._flush_table()
+        return self.flowables
+
+    def _render_line(self, raw):
+        line = raw.strip()
+
+        # 表（行頭が | の連続行をまとめて1つのTableにする）
+        if line.startswith('|'):
+            self._table_rows.append(line)
+            return
+        if self._table_rows:
+            self._flush_table()
+
+        if not line:
+            self.flowables.append(Spacer(1, 4*mm))
+            return
+
+        match = MD_LIST_RE.match(raw)
+        if match and not MD_HR_RE.match(line):
+            indent, marker, text = match.groups()
+            depth = self._list_depth(len(indent.expandtabs(4)))
+            if marker[0].isdigit():
+                style, bullet = md_ordered_style(depth), marker
+            else:
+                style, bullet = MD_LIST_STYLES[depth], MD_BULLETS[depth]
+            self.flowables.append(md_paragraph(text, style, bullet))
+            return
+        self._list_indents = []
+
+        match = MD_HEADING_RE.match(line)
+        if match:
+            style = MD_H2_STYLE if len(match.group(1)) <= 3 else MD_H3_STYLE
+            self.flowables.append(md_paragraph(match.group(2), style))
+        elif MD_HR_RE.match(line):
+            self.flowables.append(Spacer(1, 5*mm))
+        else:
+            self.flowables.append(md_paragraph(line, MD_BODY_STYLE))
+
+    def _list_depth(self, width):
+        indents = self._list_indents
+        while indents and width < indents[-1]:
+            indents.pop()
+        if not indents or width > indents[-1]:
+            indents.append(width)
+        return min(len(indents), MD_LIST_MAX_DEPTH) - 1
+
+    def _flush_table(self):
+        rows = self._table_rows
+        if not rows:
+            return
+        self._table_rows = []
+
+        # 2行目が区切り行ならその前の行がヘッダ（区切り行だけを除き、データ行の "-" は残す）
+        has_header = len(rows) > 1 and MD_TABLE_SEP_RE.match(rows[1]) is not None
+        if has_header:
+            rows = rows[:1] + rows[2:]
+        cells = [[c.strip() for c in row.strip('|').split('|')] for row in rows]
+        num_cols = max(len(r) for r in cells)
+
+        data = []
+        for i, row in enumerate(cells):
+            style = MD_HEADER_CELL_STYLE if has_header and i == 0 else MD_CELL_STYLE
+            row += [""] * (num_cols - len(row))
+            data.append([md_paragraph(c, style) for c in row])
+
+        table = Table(data, colWidths=[f'{100 / num_cols}%'] * num_cols, repeatRows=1 if has_header else 0, hAlign='LEFT')
+        table.setStyle(MD_TABLE_HEADER_STYLE if has_header else MD_TABLE_STYLE)
+        self.flowables.append(table)
+        self.flowables.append(Spacer(1, 3*mm))
+
+
+def render_markdown(text):
+    renderer = MarkdownFlowableRenderer()
+    renderer.feed(text)
+    return renderer.close()
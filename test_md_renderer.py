@@ -0,0 +1,142 @@
+import random
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Paragraph, Spacer, Table
+
+from md_renderer import (
+    MD_BODY_STYLE, MD_BOLD, MD_CODE, MD_CODE_FONT_NAME, MD_H2_STYLE, MD_HEADER_CELL_STYLE, MD_LIST_INDENT, MD_LIST_STYLES, MD_PLAIN,
+    MarkdownFlowableRenderer, md_inline, render_markdown,
+)
+
+SAMPLE = """### 1. プロファイル要約 **鉄壁の守護神**
+本文の段落です。<tag> & 記号を含みます。
+
+1. 一つ目
+2. 二つ目
+    - ネスト **太字**
+        - さらに深い
+    - ネスト2
+- トップに戻る
+---
+| 項目 | スコア |
+|:---|---:|
+| 可用性追求 | 25 |
+| 自動化思考 | 20 |
+末尾は改行なし"""
+
+
+def signature(flowables):
+    sig = []
+    for f in flowables:
+        if isinstance(f, Paragraph):
+            sig.append(("P", f.style.name, f.bulletText, f.getPlainText()))
+        elif isinstance(f, Table):
+            sig.append(("T", tuple(tuple(c.getPlainText() for c in row) for row in f._cellvalues)))
+        else:
+            sig.append((type(f).__name__,))
+    return sig
+
+
+def paragraphs(flowables):
+    return [f for f in flowables if isinstance(f, Paragraph)]
+
+
+def test_chunked_feed_matches_whole_text():
+    expected = signature(render_markdown(SAMPLE))
+    rng = random.Random(0)
+    for _ in range(100):
+        renderer = MarkdownFlowableRenderer()
+        i = 0
+        while i < len(SAMPLE):
+            n = rng.randint(1, 12)
+            renderer.feed(SAMPLE[i:i+n])
+            i += n
+        assert signature(renderer.close()) == expected
+
+
+def test_nested_list_depth():
+    paras = paragraphs(render_markdown("- a\n    - b\n        - c\n    - d\n- e"))
+    assert [p.style for p in paras] == [MD_LIST_STYLES[0], MD_LIST_STYLES[1], MD_LIST_STYLES[2], MD_LIST_STYLES[1], MD_LIST_STYLES[0]]
+    assert [p.bulletText for p in paras] == ["•", "○", "・", "○", "•"]
+
+
+def test_ordered_list_keeps_number():
+    paras = paragraphs(render_markdown("1. a\n2) b"))
+    assert [p.bulletText for p in paras] == ["1.", "2)"]
+
+
+def test_ordered_marker_width():
+    one, ten, widest = paragraphs(render_markdown("1. a\n10. b\n999. c"))
+    assert one.style.leftIndent == ten.style.leftIndent == widest.style.leftIndent
+    assert one.style.leftIndent >= MD_LIST_INDENT
+    assert widest.style.leftIndent - widest.style.bulletIndent > stringWidth("999.", widest.style.bulletFontName, widest.style.bulletFontSize)
+
+
+def test_year_is_not_an_ordered_marker():
+    para = paragraphs(render_markdown("2024. 年は転機だった"))[0]
+    assert para.style.name == "JpBody"
+    assert para.bulletText is None
+
+
+def test_table_with_header_row():
+    flowables = render_markdown("| A | B |\n|---|:-:|\n| 1 | 2 |\n| 3 |")
+    tables = [f for f in flowables if isinstance(f, Table)]
+    assert len(tables) == 1
+    table = tables[0]
+    assert [[c.getPlainText() for c in row] for row in table._cellvalues] == [["A", "B"], ["1", "2"], ["3", ""]]
+    assert table.repeatRows == 1
+    assert table._cellvalues[0][0].style is MD_HEADER_CELL_STYLE
+
+    paddings = {(c.leftPadding, c.rightPadding, c.topPadding, c.bottomPadding) for row in table._cellStyles for c in row}
+    assert paddings == {(4, 4, 4, 4)}
+
+
+def test_table_fills_available_width():
+    table = [f for f in render_markdown("| A | B | C |\n| 1 | 2 | 3 |") if isinstance(f, Table)][0]
+    width, _ = table.wrap(400, 1000)
+    assert abs(width - 400) < 0.01
+    assert len(set(table._colWidths)) == 1
+
+
+def test_table_keeps_dash_only_rows():
+    with_header = [f for f in render_markdown("| A | B |\n|---|---|\n| - | - |\n| 1 | 2 |") if isinstance(f, Table)][0]
+    assert [[c.getPlainText() for c in row] for row in with_header._cellvalues] == [["A", "B"], ["-", "-"], ["1", "2"]]
+
+    no_header = [f for f in render_markdown("| - | - |\n| 1 | 2 |") if isinstance(f, Table)][0]
+    assert [[c.getPlainText() for c in row] for row in no_header._cellvalues] == [["-", "-"], ["1", "2"]]
+    assert no_header.repeatRows == 0
+
+
+def test_heading_keeps_trailing_hash():
+    c_sharp, closed = paragraphs(render_markdown("### 得意言語: C#\n## 見出し ##"))
+    assert c_sharp.getPlainText() == "得意言語: C#"
+    assert closed.getPlainText() == "見出し"
+
+
+def test_heading_and_blank_line():
+    flowables = render_markdown("## 見出し\n\n本文")
+    assert flowables[0].style is MD_H2_STYLE
+    assert isinstance(flowables[1], Spacer)
+
+
+def test_escapes_markup_characters():
+    para = paragraphs(render_markdown("a < b & c > d"))[0]
+    assert para.getPlainText() == "a < b & c > d"
+
+
+def test_bold():
+    assert md_inline("a **b** c") == [(MD_PLAIN, "a "), (MD_BOLD, "b"), (MD_PLAIN, " c")]
+
+
+def test_code_span_is_not_parsed_as_bold():
+    assert md_inline("x `a**b**c` y") == [(MD_PLAIN, "x "), (MD_CODE, "a**b**c"), (MD_PLAIN, " y")]
+    assert md_inline("**b** `__init__`") == [(MD_BOLD, "b"), (MD_PLAIN, " "), (MD_CODE, "__init__")]
+
+
+def test_underscores_are_not_bold():
+    assert md_inline("__init__ と a__b__c") == [(MD_PLAIN, "__init__ と a__b__c")]
+
+
+def test_code_font():
+    para = paragraphs(render_markdown("`x` と `日本語`"))[0]
+    assert [f.fontName for f in para.frags] == [MD_CODE_FONT_NAME, MD_BODY_STYLE.fontName, MD_BODY_STYLE.fontName]